@@ -1,3 +1,8 @@
+import os
+import sys
+from collections.abc import Callable
+from typing import Any
+
 from pydantic_ai.messages import (
     ModelMessage,
     ModelRequest,
@@ -8,31 +13,81 @@ from pydantic_ai.messages import (
     UserPromptPart,
 )
 
+# Set PYDANTIC_AI_DUMP_HISTORY=0 to turn the dump off without removing the history processor
+_DEBUG_HISTORY = os.environ.get("PYDANTIC_AI_DUMP_HISTORY", "1") == "1"
+
+
+def _max_content_from_env(default: int = 2000) -> int:
+    try:
+        return int(os.environ.get("PYDANTIC_AI_DUMP_MAX_CONTENT", default))
+    except ValueError:
+        return default
+
+
+# Longest content shown per part, larger contents are cut off
+_MAX_CONTENT = _max_content_from_env()
+
+_HEADER_RULE = "=" * 20
+_FOOTER_RULE = "=" * 60
+
+
+def _fmt_content(value: Any) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= _MAX_CONTENT:
+        return text
+    return f"{text[:_MAX_CONTENT]}...<+{len(text) - _MAX_CONTENT} chars>"
+
+
+def _fmt_user_prompt(part: UserPromptPart) -> str:
+    return f"  User Prompt: {_fmt_content(part.content)}"
+
+
+def _fmt_text(part: TextPart) -> str:
+    return f"  Text: {_fmt_content(part.content)}"
+
+
+def _fmt_tool_call(part: ToolCallPart) -> str:
+    return f"  Tool Call: {part.tool_name}({_fmt_content(part.args)}) [ID: {part.tool_call_id}]"
+
+
+def _fmt_tool_return(part: ToolReturnPart) -> str:
+    return f"  Tool Return: {part.tool_name} [ID: {part.tool_call_id}]\n    Result: {_fmt_content(part.content)}"
+
+
+# Dispatch on the exact type of messages and parts. These pydantic-ai classes are leaf
+# classes that are never subclassed, so a dict lookup replaces the isinstance chain.
+_ROLES: dict[type, str] = {
+    ModelRequest: "USER (or Tool Return)",
+    ModelResponse: "MODEL",
+}
+
+_PART_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    UserPromptPart: _fmt_user_prompt,
+    TextPart: _fmt_text,
+    ToolCallPart: _fmt_tool_call,
+    ToolReturnPart: _fmt_tool_return,
+}
+
 
 def dump_history(history: list[ModelMessage]):
     """
     Dump the history in a human-readable format.
     """
-    print(f"\n{'=' * 20} HISTORY DUMP ({len(history)} messages) {'=' * 20}")
+    if not _DEBUG_HISTORY:
+        return history
+
+    # Collect all lines and write them at once instead of one print per line
+    out: list[str] = [f"\n{_HEADER_RULE} HISTORY DUMP ({len(history)} messages) {_HEADER_RULE}"]
     for i, msg in enumerate(history):
-        role = "UNKNOWN"
-        if isinstance(msg, ModelRequest):
-            role = "USER (or Tool Return)"
-        elif isinstance(msg, ModelResponse):
-            role = "MODEL"
+        role = _ROLES.get(type(msg), "UNKNOWN")
 
-        print(f"\n[{i}] {role} (timestamp: {msg.timestamp}):")
+        out.append(f"\n[{i}] {role} (timestamp: {msg.timestamp}):")
         for part in msg.parts:
-            if isinstance(part, UserPromptPart):
-                print(f"  User Prompt: {part.content}")
-            elif isinstance(part, TextPart):
-                print(f"  Text: {part.content}")
-            elif isinstance(part, ToolCallPart):
-                print(f"  Tool Call: {part.tool_name}({part.args}) [ID: {part.tool_call_id}]")
-            elif isinstance(part, ToolReturnPart):
-                print(f"  Tool Return: {part.tool_name} [ID: {part.tool_call_id}]")
-                print(f"    Result: {part.content}")
+            fmt = _PART_FORMATTERS.get(type(part))
+            if fmt is not None:
+                out.append(fmt(part))
             else:
-                print(f"  Unknown Part: {part}")
-    print(f"{'=' * 60}\n")
+                out.append(f"  Unknown Part: {_fmt_content(part)}")
+    out.append(f"{_FOOTER_RULE}\n")
+    sys.stdout.write("\n".join(out) + "\n")
     return history
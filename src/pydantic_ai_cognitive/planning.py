@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, replace
+from typing import Any
 
 from pydantic_ai import FunctionToolset
 from pydantic_ai.messages import (
@@ -9,10 +10,29 @@ from pydantic_ai.messages import (
     ToolReturnPart,
 )
 
-from .utils import EnumerateMessageWithParts
+from .utils import iter_message_parts
 
 
-@dataclass
+def _with_parts(message: ModelMessage, parts: list[Any]) -> ModelMessage:
+    """
+    Return a shallow copy of the message with its parts replaced.
+
+    Copying the instance dict is much cheaper than dataclasses.replace, which re-runs
+    __init__ with every field. Messages without a __dict__ fall back to replace.
+    """
+    state = getattr(message, "__dict__", None)
+    if state is None:
+        # Ignore type check because we don't have a good type for new parts
+        return replace(message, parts=parts)  # type: ignore[arg-type]
+
+    new_message = object.__new__(type(message))
+    new_message.__dict__.update(state)
+    new_message.__dict__["parts"] = parts
+    return new_message
+
+
+# Slotted to keep per-step memory down for long plans. Frozen, so a step only changes through Planning.
+@dataclass(frozen=True, slots=True)
 class PlanStep:
     id: int
     description: str
@@ -21,17 +41,45 @@ class PlanStep:
 
 @dataclass
 class Planning:
-    steps: list[PlanStep] = field(default_factory=list)
+    """
+    A step-by-step plan the agent manages through the plan_* tools.
+
+    The steps are a tuple of frozen PlanStep, so the plan only changes through the plan_*
+    methods, reset, or by assigning a new tuple of steps.
+    """
+
+    steps: tuple[PlanStep, ...] = ()
+    # Steps tuple and the plan rendered from it, reused while steps is the same tuple
+    _rendered: tuple[tuple[PlanStep, ...], str] | None = field(default=None, init=False, repr=False, compare=False)
+    # Steps tuple and the position of each of its steps by ID, rebuilt when steps is another tuple
+    _index: tuple[tuple[PlanStep, ...], dict[int, int]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Accept any sequence of steps, such as a list
+        self.steps = tuple(self.steps)
 
     def __str__(self) -> str:
-        if not self.steps:
+        steps = self.steps
+        if self._rendered is not None and self._rendered[0] is steps:
+            return self._rendered[1]
+
+        if not steps:
             return "No plan created yet."
 
-        lines = ["Current Plan:"]
-        for step in self.steps:
-            status = "[x]" if step.completed else "[ ]"
-            lines.append(f"{status} {step.id}. {step.description}")
-        return "\n".join(lines)
+        rendered = "\n".join([
+            "Current Plan:",
+            *(f"{'[x]' if step.completed else '[ ]'} {step.id}. {step.description}" for step in steps),
+        ])
+        self._rendered = (steps, rendered)
+        return rendered
+
+    def _step_positions(self) -> dict[int, int]:
+        """Return the position of each step by ID, reusing the index while steps is the same tuple."""
+        if self._index is None or self._index[0] is not self.steps:
+            self._index = (self.steps, {step.id: i for i, step in enumerate(self.steps)})
+        return self._index[1]
 
     def plan_create(self, steps: list[str]) -> str:
         """
@@ -44,27 +92,31 @@ class Planning:
         4. You can check your progress using 'plan_show_progress'.
         5. Follow the plan strictly.
         """
-        self.steps = [PlanStep(id=i + 1, description=s) for i, s in enumerate(steps)]
+        self.steps = tuple(PlanStep(id=i + 1, description=s) for i, s in enumerate(steps))
         return str(self)
 
     def plan_mark_step_complete(self, step_id: int) -> str:
         """Mark a step as complete by its ID."""
-        found = False
-        for step in self.steps:
-            if step.id == step_id:
-                step.completed = True
-                found = True
-                break
-
-        if not found:
+        positions = self._step_positions()
+        position = positions.get(step_id)
+        if position is None:
             return f"Step {step_id} not found."
 
+        steps = self.steps
+        if not steps[position].completed:
+            self.steps = (*steps[:position], replace(steps[position], completed=True), *steps[position + 1 :])
+            # Positions do not move when a step is replaced, so the index carries over to the new tuple
+            self._index = (self.steps, positions)
         return str(self)
 
     def plan_show_progress(self) -> str:
         """Show the current progress of the plan."""
         return str(self)
 
+    def reset(self) -> None:
+        """Discard the current plan."""
+        self.steps = ()
+
     def plan_history_processor(self, history: list[ModelMessage]) -> list[ModelMessage]:
         """
         Process the history to keep only the most recent planning tool calls.
@@ -73,46 +125,62 @@ class Planning:
         create_plan / plan_mark_step_complete / plan_show_progress for each of them.
         It removes the entire pair (ToolCall and ToolReturn) for redundant calls.
         """
-        planning_tools = {
-            self.plan_create.__name__,
-            self.plan_mark_step_complete.__name__,
-            self.plan_show_progress.__name__,
-        }
-
-        # Collect tool_call_ids to remove by scanning backwards
-        ids_to_remove: set[str] = set()
-        found_tools: set[str] = set()
+        ids_to_remove = self._find_redundant_planning_calls(history)
 
-        for _, parts in EnumerateMessageWithParts(reversed(history)):
-            for part in reversed(parts):
-                if isinstance(part, ToolCallPart) and part.tool_name in planning_tools:
-                    if part.tool_name in found_tools and part.tool_call_id:
-                        ids_to_remove.add(part.tool_call_id)
-                    else:
-                        found_tools.add(part.tool_name)
+        if not ids_to_remove:
+            # Nothing is redundant, hand the same list on to the next processor
+            return history
 
         # Reconstruct history filtering out marked calls and their returns
         new_history: list[ModelMessage] = []
-        for message, parts in EnumerateMessageWithParts(history):
-            new_parts = []
-            original_parts_count = len(parts)
-
-            for part in parts:
-                if isinstance(part, (ToolCallPart, ToolReturnPart)) and part.tool_call_id in ids_to_remove:
-                    continue
-                new_parts.append(part)
+        for message, parts in iter_message_parts(history):
+            new_parts = [
+                part
+                for part in parts
+                if not (
+                    (type(part) is ToolCallPart or type(part) is ToolReturnPart) and part.tool_call_id in ids_to_remove
+                )
+            ]
 
             if not new_parts:
                 # If the message became empty after removal, skip it
                 pass
-            elif len(new_parts) == original_parts_count:
+            elif len(new_parts) == len(parts):
                 new_history.append(message)
             else:
-                # Create a new message with filtered parts using replace
-                # Ignore type check because we don't have a good type for new parts
-                new_history.append(replace(message, parts=new_parts))  # type: ignore[arg-type]
+                # Create a new message with filtered parts
+                new_history.append(_with_parts(message, new_parts))
 
         return new_history
 
+    def _find_redundant_planning_calls(self, history: list[ModelMessage]) -> set[str]:
+        """
+        Collect the tool_call_ids of planning tool calls superseded by a later call to the same tool.
+        """
+        # Track the latest tool_call_id per planning tool in a single forward pass,
+        # every call it supersedes is marked for removal
+        latest: dict[str, str] = {}
+        ids_to_remove: set[str] = set()
+
+        # Parts are matched on their exact type rather than with isinstance: ToolCallPart and
+        # ToolReturnPart are leaf classes in pydantic-ai and are never subclassed.
+        for _, parts in iter_message_parts(history):
+            for part in parts:
+                if type(part) is ToolCallPart and part.tool_name in _PLANNING_TOOLS:
+                    previous_id = latest.get(part.tool_name)
+                    if previous_id:
+                        ids_to_remove.add(previous_id)
+                    latest[part.tool_name] = part.tool_call_id
+
+        return ids_to_remove
+
     def toolset(self) -> FunctionToolset[object]:
         return FunctionToolset(tools=[self.plan_create, self.plan_mark_step_complete, self.plan_show_progress])
+
+
+# Names of the planning tools, as exposed by Planning.toolset()
+_PLANNING_TOOLS: frozenset[str] = frozenset({
+    Planning.plan_create.__name__,
+    Planning.plan_mark_step_complete.__name__,
+    Planning.plan_show_progress.__name__,
+})
@@ -1,12 +1,224 @@
 from __future__ import annotations
 
+import codecs
+import copy
+import os
 import re
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
-import yaml
 from pydantic_ai import FunctionToolset, Tool
 
+# YAML frontmatter between --- markers at the top of skill.md
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+
+# The frontmatter sits at the top of skill.md, so only this many bytes are read up front.
+_FRONTMATTER_READ_SIZE = 8192
+
+# O_BINARY only exists (and matters) on Windows
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Characters that start YAML structure (collections, block scalars, anchors, tags, ...) in a value
+_YAML_INDICATORS = "-?:,[]{}#&*!|>%@`"
+
+# Plain scalars that YAML resolves to something other than a string
+_YAML_NON_STR_SCALARS = frozenset({"~", "null", "true", "false", "yes", "no", "on", "off"})
+
+# Plain scalars that safe_load rejects: the value key "=" and the merge key "<<"
+_YAML_REJECTED_SCALARS = frozenset({"=", "<<"})
+
+
+def _is_plain_string(scalar: str) -> bool:
+    """Check whether YAML reads the unquoted, non-empty scalar as the same plain string."""
+    return not (
+        scalar[0] in _YAML_INDICATORS
+        or scalar[0] in "+."
+        or scalar[0].isdigit()
+        or "#" in scalar
+        or ": " in scalar
+        or scalar.endswith(":")
+        or scalar.lower() in _YAML_NON_STR_SCALARS
+        or scalar in _YAML_REJECTED_SCALARS
+    )
+
+
+def _parse_simple_frontmatter(frontmatter_text: str) -> dict[str, str | None] | None:
+    """
+    Parse frontmatter made only of flat `key: value` lines without going through YAML.
+
+    Returns:
+        The parsed mapping, or None if the frontmatter uses YAML features that need the full parser
+        or has no keys at all (YAML reads empty frontmatter as null, not as an empty mapping).
+    """
+    metadata: dict[str, str | None] = {}
+    for line in frontmatter_text.splitlines():
+        # Tabs are rejected by YAML in most places, so lines with tabs (even blank ones) go to the full parser
+        if not line.strip(" ") or line.startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or "\t" in line or value[:1] not in ("", " ") or line[0] == " ":
+            return None
+        key, value = key.strip(), value.strip()
+        if not key or key[0] in "'\"" or not _is_plain_string(key):
+            return None
+
+        if not value:
+            # An empty plain value is null in YAML
+            metadata[key] = None
+        elif value[0] in ("'", '"'):
+            # Quoted value, as long as it has no escapes or embedded quotes
+            inner = value[1:-1]
+            if len(value) < 2 or value[-1] != value[0] or value[0] in inner or "\\" in inner:
+                return None
+            metadata[key] = inner
+        elif _is_plain_string(value):
+            metadata[key] = value
+        else:
+            return None
+    return metadata or None
+
+
+def _match_frontmatter(skill_md_path: Path, file_size: int) -> re.Match[str] | None:
+    """
+    Read the head of skill.md and match the YAML frontmatter between --- markers.
+
+    Args:
+        skill_md_path: Path to the skill.md file.
+        file_size: Size of the file in bytes, used to detect frontmatter longer than the head.
+
+    Returns:
+        The frontmatter match, or None if the file has no frontmatter.
+
+    Raises:
+        ValueError: If the file cannot be read.
+    """
+    try:
+        fd = os.open(skill_md_path, _READ_FLAGS)
+        try:
+            head = os.read(fd, _FRONTMATTER_READ_SIZE)
+        finally:
+            os.close(fd)
+        # Incremental decoding tolerates a multi-byte character cut off at the end of the head
+        content = codecs.getincrementaldecoder("utf-8")().decode(head)
+        match = _FRONTMATTER_RE.match(content)
+
+        if not match and file_size > len(head):
+            # Frontmatter is longer than the head, fall back to reading the whole file
+            content = skill_md_path.read_text(encoding="utf-8")
+            match = _FRONTMATTER_RE.match(content)
+    except Exception as e:
+        raise ValueError(f"Failed to read skill.md at {skill_md_path}: {e}") from e
+
+    return match
+
+
+def _parse_frontmatter(frontmatter_text: str, skill_md_path: Path) -> Any:
+    """
+    Parse the frontmatter text, only going through YAML when it is more than flat `key: value` lines.
+
+    Args:
+        frontmatter_text: The text between the --- markers.
+        skill_md_path: Path to the skill.md file, used in error messages.
+
+    Returns:
+        The parsed frontmatter.
+
+    Raises:
+        ValueError: If the frontmatter is not valid YAML.
+    """
+    metadata = _parse_simple_frontmatter(frontmatter_text)
+    if metadata is not None:
+        return metadata
+
+    # Imported lazily, most frontmatter never needs the YAML parser
+    import yaml
+
+    try:
+        return yaml.safe_load(frontmatter_text)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML frontmatter in {skill_md_path}: {e}") from e
+
+
+@lru_cache(maxsize=1024)
+def _load_metadata(path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """
+    Read, parse and validate the frontmatter of a skill.md file.
+
+    Memoized on the file's modification time and size, so unchanged skill.md files
+    are not read and parsed again on every registration.
+
+    Raises:
+        ValueError: If frontmatter is missing or description is not provided.
+    """
+    skill_md_path = Path(path)
+
+    match = _match_frontmatter(skill_md_path, size)
+
+    if not match:
+        raise ValueError(
+            f"No YAML frontmatter found in {skill_md_path}. "
+            "Expected format:\n---\nname: skill-name\ndescription: skill-description\n---"
+        )
+
+    frontmatter_text = match.group(1)
+
+    metadata = _parse_frontmatter(frontmatter_text, skill_md_path)
+
+    # Validate required fields
+    if not isinstance(metadata, dict):
+        raise TypeError(f"YAML frontmatter must be a dictionary in {skill_md_path}")
+
+    if "name" not in metadata:
+        raise ValueError(f"Missing required 'name' field in {skill_md_path}")
+
+    if not metadata["name"] or not metadata["name"].strip():
+        raise ValueError(f"Empty 'name' field in {skill_md_path}")
+
+    if "description" not in metadata:
+        raise ValueError(f"Missing required 'description' field in {skill_md_path}")
+
+    if not metadata["description"] or not metadata["description"].strip():
+        raise ValueError(f"Empty 'description' field in {skill_md_path}")
+
+    return metadata
+
+
+@lru_cache(maxsize=64)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read a skill artifact, memoized on its modification time and size.
+
+    mtime_ns and size are only used as part of the cache key, so a modified file is read again.
+    """
+    return Path(path).read_text(encoding="utf-8")
+
+
+def _iter_skill_mds(root: str) -> Iterator[str]:
+    """
+    Recursively yield the paths of all skill.md files under root.
+
+    Directory entries are matched by name only, so no Path objects are created for the
+    other files in the tree. Symlinked directories are not followed.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name == "skill.md" and entry.is_file():
+                        yield entry.path
+        except PermissionError:
+            continue
+        # Reversed so that subdirectories are visited in the order they were listed
+        stack.extend(reversed(subdirs))
+
 
 @dataclass
 class SkillMetadata:
@@ -29,8 +241,11 @@ class Skills:
     """
 
     _skills: dict[str, SkillMetadata] = field(default_factory=dict)
+    # Bumped on every registration, so the cached skill_load tool is rebuilt only when skills change
+    _generation: int = field(default=0, init=False, repr=False, compare=False)
+    _tool_cache: tuple[int, Tool[object]] | None = field(default=None, init=False, repr=False, compare=False)
 
-    def register_skill(self, skill_folder: str | Path) -> None:
+    def register_skill(self, skill_folder: str | Path | Sequence[str | Path]) -> None:
         """
         Register skills from a folder by searching for skill.md files.
 
@@ -40,14 +255,24 @@ class Skills:
         - skill_folder/skill_2/skill.md
         - skill_folder/foo/bar/skill.md
 
+        A sequence of folders can be passed to register all of them in one call.
+
         Args:
-            skill_folder: Path to the folder containing skill definitions (str or Path).
+            skill_folder: Path to the folder containing skill definitions (str or Path),
+                          or a sequence of such folders.
 
         Raises:
             FileNotFoundError: If the skill folder doesn't exist.
-            ValueError: If no skill.md files are found or metadata is invalid.
+            ValueError: If no skill.md files are found, metadata is invalid, or the sequence is empty.
         """
-        folder_path = Path(skill_folder) if isinstance(skill_folder, str) else skill_folder
+        if not isinstance(skill_folder, (str, os.PathLike)):
+            if not skill_folder:
+                raise ValueError("No skill folders given")
+            for folder in skill_folder:
+                self.register_skill(folder)
+            return
+
+        folder_path = Path(skill_folder)
 
         if not folder_path.exists():
             raise FileNotFoundError(f"Skill folder not found: {skill_folder}")
@@ -56,11 +281,13 @@ class Skills:
             raise ValueError(f"Skill path must be a directory: {skill_folder}")
 
         # Recursively search for all skill.md files
-        skill_md_files = list(folder_path.rglob("skill.md"))
+        skill_md_files = [Path(path) for path in _iter_skill_mds(str(folder_path))]
 
         if not skill_md_files:
             raise ValueError(f"No skill.md files found in folder: {skill_folder}")
 
+        self._generation += 1
+
         # Process all skill.md files found
         for skill_md_path in skill_md_files:
             # Extract metadata from the skill.md file
@@ -92,44 +319,11 @@ class Skills:
             ValueError: If frontmatter is missing or description is not provided.
         """
         try:
-            content = skill_md_path.read_text(encoding="utf-8")
+            stat = skill_md_path.stat()
         except Exception as e:
             raise ValueError(f"Failed to read skill.md at {skill_md_path}: {e}") from e
 
-        # Find YAML frontmatter between --- markers
-        frontmatter_pattern = r"^---\s*\n(.*?)\n---\s*\n"
-        match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-        if not match:
-            raise ValueError(
-                f"No YAML frontmatter found in {skill_md_path}. "
-                "Expected format:\n---\nname: skill-name\ndescription: skill-description\n---"
-            )
-
-        frontmatter_text = match.group(1)
-
-        try:
-            metadata = yaml.safe_load(frontmatter_text)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML frontmatter in {skill_md_path}: {e}") from e
-
-        # Validate required fields
-        if not isinstance(metadata, dict):
-            raise TypeError(f"YAML frontmatter must be a dictionary in {skill_md_path}")
-
-        if "name" not in metadata:
-            raise ValueError(f"Missing required 'name' field in {skill_md_path}")
-
-        if not metadata["name"] or not metadata["name"].strip():
-            raise ValueError(f"Empty 'name' field in {skill_md_path}")
-
-        if "description" not in metadata:
-            raise ValueError(f"Missing required 'description' field in {skill_md_path}")
-
-        if not metadata["description"] or not metadata["description"].strip():
-            raise ValueError(f"Empty 'description' field in {skill_md_path}")
-
-        return metadata
+        return _load_metadata(str(skill_md_path), stat.st_mtime_ns, stat.st_size)
 
     def skill_load(self, skill_name: str, artifact_path: str | None = None) -> str:
         """
@@ -161,11 +355,11 @@ class Skills:
         else:
             target_file = skill_meta.folder_path / artifact_path
 
-        if not target_file.exists():
-            return f"Error: Artifact file not found: {target_file}"
-
         try:
-            return target_file.read_text(encoding="utf-8")
+            stat = target_file.stat()
+            return _read_text_cached(str(target_file), stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return f"Error: Artifact file not found: {target_file}"
         except Exception as e:
             return f"Error: Failed to read artifact file {target_file}: {e}"
 
@@ -178,16 +372,29 @@ class Skills:
         on how to use them.
 
         Returns:
-            A FunctionToolset containing the skill_load tool with dynamic schema.
+            A new FunctionToolset containing the skill_load tool with dynamic schema.
+        """
+        # FunctionToolset.add_tool sets max_retries and metadata on the tool, so each toolset gets its own copy
+        return FunctionToolset(tools=[copy.copy(self._skill_load_tool())])
+
+    def _skill_load_tool(self) -> Tool[object]:
+        """
+        Build the skill_load tool, reusing the cached one until another skill is registered.
+
+        Returns:
+            The skill_load tool with a description of all registered skills.
         """
+        if self._tool_cache is not None and self._tool_cache[0] == self._generation:
+            return self._tool_cache[1]
+
         # Build detailed skills list with metadata
         if self._skills:
             skills_list = []
             for name, meta in self._skills.items():
-                skill_entry = f"  - name: {name}\n    description: {meta.description}"
+                entry_parts = [f"  - name: {name}\n    description: {meta.description}"]
                 if meta.license:
-                    skill_entry += f"\n    license: {meta.license}"
-                skills_list.append(skill_entry)
+                    entry_parts.append(f"\n    license: {meta.license}")
+                skills_list.append("".join(entry_parts))
             skills_text = "\n\n".join(skills_list)
         else:
             skills_text = "  (No skills registered yet)"
@@ -250,4 +457,5 @@ If needed for a complete answer, you can load additional referenced files."""
             takes_ctx=False,
         )
 
-        return FunctionToolset(tools=[skill_load_tool])
+        self._tool_cache = (self._generation, skill_load_tool)
+        return skill_load_tool
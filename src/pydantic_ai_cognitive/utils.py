@@ -1,21 +1,17 @@
-from collections.abc import Iterable, Iterator
+from collections.abc import Iterable, Iterator, Sequence
 
 from pydantic_ai.messages import ModelMessage, ModelRequestPart, ModelResponsePart
 
 
-class EnumerateMessageWithParts:
+def iter_message_parts(
+    history: Iterable[ModelMessage],
+) -> Iterator[tuple[ModelMessage, Sequence[ModelRequestPart | ModelResponsePart]]]:
     """
-    Enumerable over all parts in the message history.
-    """
-
-    def __init__(self, history: Iterable[ModelMessage]):
-        self.history = history
+    Iterate over all parts in the message history.
 
-    def __iter__(self) -> Iterator[tuple[ModelMessage, list[ModelRequestPart | ModelResponsePart]]]:
-        """
-        Yields:
-            A tuple containing the message and the list of parts.
-        """
-        for message in self.history:
-            parts = getattr(message, "parts", [])
-            yield message, parts
+    Yields:
+        A tuple containing the message and the list of parts.
+    """
+    # Both ModelRequest and ModelResponse declare parts, so no getattr fallback is needed
+    for message in history:
+        yield message, message.parts
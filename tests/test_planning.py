@@ -1,5 +1,7 @@
+from collections.abc import Iterator
 from datetime import datetime
 
+import pytest
 from pydantic_ai.messages import (
     ModelRequest,
     ModelResponse,
@@ -10,11 +12,54 @@ from pydantic_ai.messages import (
     UserPromptPart,
 )
 
-from pydantic_ai_cognitive.planning import Planning
+from pydantic_ai_cognitive.planning import Planning, PlanStep
 
+# Shared by every message built below. RequestUsage is mutable, so tests must not modify it.
+_TS = datetime.now()
+_USAGE = RequestUsage()
 
-def test_plan_create():
-    planning = Planning()
+
+@pytest.fixture(scope="module")
+def planning() -> Planning:
+    return Planning()
+
+
+@pytest.fixture(autouse=True)
+def _reset_planning(planning: Planning) -> Iterator[None]:
+    yield
+    planning.reset()
+
+
+def _mk_user(content: str) -> ModelRequest:
+    return ModelRequest(parts=[UserPromptPart(content=content)], kind="request", timestamp=_TS)
+
+
+def _mk_call(tool: str, args: dict, cid: str) -> ModelResponse:
+    return ModelResponse(
+        parts=[ToolCallPart(tool_name=tool, args=args, tool_call_id=cid)], kind="response", timestamp=_TS, usage=_USAGE
+    )
+
+
+def _mk_return(tool: str, content: str, cid: str) -> ModelRequest:
+    return ModelRequest(
+        parts=[ToolReturnPart(tool_name=tool, content=content, tool_call_id=cid)], kind="request", timestamp=_TS
+    )
+
+
+def _mk_history(calls: list[tuple[str, str]]) -> list[ModelRequest | ModelResponse]:
+    """Build a user prompt followed by a call/return pair for each (tool, tool_call_id)."""
+    history: list[ModelRequest | ModelResponse] = [_mk_user("Start")]
+    for tool, cid in calls:
+        history.append(_mk_call(tool, {}, cid))
+        history.append(_mk_return(tool, f"{tool} done", cid))
+    return history
+
+
+def _present_tool_call_ids(history: list) -> set[str]:
+    return {p.tool_call_id for m in history for p in m.parts if isinstance(p, (ToolCallPart, ToolReturnPart))}
+
+
+def test_plan_create(planning: Planning):
     steps = ["Step 1", "Step 2"]
     result = planning.plan_create(steps)
     assert "1. Step 1" in result
@@ -24,8 +69,7 @@ def test_plan_create():
     assert len(planning.steps) == 2
 
 
-def test_plan_mark_step_complete() -> None:
-    planning = Planning()
+def test_plan_mark_step_complete(planning: Planning) -> None:
     planning.plan_create(["Do X", "Do Y"])
 
     result = planning.plan_mark_step_complete(1)
@@ -39,8 +83,42 @@ def test_plan_mark_step_complete() -> None:
     assert "Step 99 not found" in result
 
 
-def test_plan_show_progress() -> None:
-    planning = Planning()
+def test_plan_mark_step_complete_with_initial_steps() -> None:
+    planning = Planning(steps=(PlanStep(id=1, description="Do X"), PlanStep(id=2, description="Do Y")))
+
+    result = planning.plan_mark_step_complete(2)
+    assert "[ ] 1" in result
+    assert "[x] 2" in result
+
+
+def test_plan_mark_step_complete_after_changing_steps(planning: Planning) -> None:
+    planning.plan_create(["A", "B"])
+    planning.steps = (*planning.steps, PlanStep(id=3, description="C"))
+
+    assert "[x] 3. C" in planning.plan_mark_step_complete(3)
+
+    planning.steps = (PlanStep(id=1, description="X"),)
+
+    result = planning.plan_mark_step_complete(1)
+    assert "[x] 1. X" in result
+    assert planning.steps[0].completed
+
+    planning.steps = ()
+    assert "Step 1 not found" in planning.plan_mark_step_complete(1)
+
+
+def test_plan_steps_are_read_only(planning: Planning) -> None:
+    planning.plan_create(["A", "B"])
+
+    with pytest.raises(TypeError):
+        planning.steps[0] = PlanStep(id=1, description="new A")  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        planning.steps[0].completed = True  # type: ignore[misc]
+
+    assert "[x] 1. A" in planning.plan_mark_step_complete(1)
+
+
+def test_plan_show_progress(planning: Planning) -> None:
     planning.plan_create(["A", "B"])
     result = planning.plan_show_progress()
     assert "Current Plan:" in result
@@ -48,9 +126,28 @@ def test_plan_show_progress() -> None:
     assert "[ ] 2. B" in result
 
 
-def test_toolset_instructions() -> None:
+def test_plan_show_progress_after_assigning_steps(planning: Planning) -> None:
+    planning.plan_create(["A", "B"])
+    assert "[ ] 1. A" in planning.plan_show_progress()
+
+    planning.steps = (PlanStep(id=1, description="X", completed=True),)
+
+    assert planning.plan_show_progress() == "Current Plan:\n[x] 1. X"
+
+
+def test_plan_reset(planning: Planning) -> None:
+    planning.plan_create(["A", "B"])
+    planning.plan_mark_step_complete(1)
+
+    planning.reset()
+
+    assert planning.steps == ()
+    assert planning.plan_show_progress() == "No plan created yet."
+    assert "Step 1 not found" in planning.plan_mark_step_complete(1)
+
+
+def test_toolset_instructions(planning: Planning) -> None:
     """Verify that the planning instructions are included in the tool description."""
-    planning = Planning()
     tools = planning.toolset().tools
     plan_create_tool = tools["plan_create"]
 
@@ -60,190 +157,98 @@ def test_toolset_instructions() -> None:
     assert "you MUST call 'plan_create'" in plan_create_tool.description
 
 
-def test_plan_history_processor() -> None:
-    planning = Planning()
-    # Setup some timestamps
-    ts = datetime.now()
-
-    # Create a history with redundant calls
-    # Sequence:
-    # 1. plan_create (old)
-    # 2. plan_create (new - keep)
-    # 3. plan_mark_step_complete (step 1) -> (old)
-    # 4. plan_show_progress (old)
-    # 5. plan_mark_step_complete (step 2) -> (new - keep)
-    # 6. plan_show_progress (new - keep)
-    # Also include some user/text parts that should remain
-
-    history: list[ModelRequest | ModelResponse] = [
-        # Message 0: User prompt
-        ModelRequest(parts=[UserPromptPart(content="Start")], kind="request", timestamp=ts),
-        # Message 1: plan_create (OLD) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_create", args={"steps": ["A", "B"]}, tool_call_id="id_create_1")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 2: plan_create (OLD) - Return
-        ModelRequest(
-            parts=[ToolReturnPart(tool_name="plan_create", content="Plan created", tool_call_id="id_create_1")],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 3: plan_create (NEW) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_create", args={"steps": ["A", "B", "C"]}, tool_call_id="id_create_2")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 4: plan_create (NEW) - Return
-        ModelRequest(
-            parts=[ToolReturnPart(tool_name="plan_create", content="Plan created 2", tool_call_id="id_create_2")],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 5: plan_mark_step_complete (OLD) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_mark_step_complete", args={"step_id": 1}, tool_call_id="id_mark_1")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 6: plan_mark_step_complete (OLD) - Return
-        ModelRequest(
-            parts=[
-                ToolReturnPart(tool_name="plan_mark_step_complete", content="Step 1 done", tool_call_id="id_mark_1")
+@pytest.mark.parametrize(
+    "calls,expected_keep_ids",
+    [
+        pytest.param(
+            [("plan_create", "id_create_1"), ("plan_create", "id_create_2")],
+            {"id_create_2"},
+            id="repeated_create",
+        ),
+        pytest.param(
+            [
+                ("plan_create", "id_create_1"),
+                ("plan_create", "id_create_2"),
+                ("plan_mark_step_complete", "id_mark_1"),
+                ("plan_show_progress", "id_show_1"),
+                ("plan_mark_step_complete", "id_mark_2"),
+                ("plan_show_progress", "id_show_2"),
             ],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 7: plan_show_progress (OLD) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_show_progress", args={}, tool_call_id="id_show_1")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 8: plan_show_progress (OLD) - Return
-        ModelRequest(
-            parts=[ToolReturnPart(tool_name="plan_show_progress", content="Progress 1", tool_call_id="id_show_1")],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 9: plan_mark_step_complete (NEW) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_mark_step_complete", args={"step_id": 2}, tool_call_id="id_mark_2")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 10: plan_mark_step_complete (NEW) - Return
-        ModelRequest(
-            parts=[
-                ToolReturnPart(tool_name="plan_mark_step_complete", content="Step 2 done", tool_call_id="id_mark_2")
+            {"id_create_2", "id_mark_2", "id_show_2"},
+            id="interleaved_tools",
+        ),
+        pytest.param(
+            [
+                ("plan_show_progress", "id_show_1"),
+                ("plan_show_progress", "id_show_2"),
+                ("plan_show_progress", "id_show_3"),
             ],
-            kind="request",
-            timestamp=ts,
+            {"id_show_3"},
+            id="many_show_progress",
         ),
-        # Message 11: plan_show_progress (NEW) - Call
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_show_progress", args={}, tool_call_id="id_show_2")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
+        pytest.param(
+            [("plan_create", "id_create_1"), ("other_tool", "id_other_1"), ("other_tool", "id_other_2")],
+            {"id_create_1", "id_other_1", "id_other_2"},
+            id="non_planning_tools_kept",
         ),
-        # Message 12: plan_show_progress (NEW) - Return
-        ModelRequest(
-            parts=[ToolReturnPart(tool_name="plan_show_progress", content="Progress 2", tool_call_id="id_show_2")],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 13: Mixed content (Text + ToolCall)
-        # We want to test that if a message has text AND a redundant tool call, the tool call is removed but text remains.
-        # This one (id_show_3) will be made redundant by a later call.
+    ],
+)
+def test_plan_history_processor(calls: list[tuple[str, str]], expected_keep_ids: set[str]) -> None:
+    planning = Planning()
+    history = _mk_history(calls)
+
+    new_history = planning.plan_history_processor(history)
+
+    # Redundant calls are removed together with their returns, so whole messages disappear
+    assert _present_tool_call_ids(new_history) == expected_keep_ids
+    assert len(new_history) == 1 + 2 * len(expected_keep_ids)
+    assert new_history[0] is history[0]
+
+
+def test_plan_history_processor_mixed_message() -> None:
+    """A redundant call sharing a message with text only loses the tool call part."""
+    planning = Planning()
+    history = _mk_history([("plan_show_progress", "id_show_1")])
+    history.append(
         ModelResponse(
             parts=[
                 TextPart(content="Thinking..."),
-                ToolCallPart(tool_name="plan_show_progress", args={}, tool_call_id="id_show_3_mixed"),
+                ToolCallPart(tool_name="plan_show_progress", args={}, tool_call_id="id_show_2_mixed"),
             ],
             kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 14: Return for id_show_3_mixed (should be removed)
-        ModelRequest(
-            parts=[
-                ToolReturnPart(tool_name="plan_show_progress", content="Progress 3", tool_call_id="id_show_3_mixed")
-            ],
-            kind="request",
-            timestamp=ts,
-        ),
-        # Message 15: plan_show_progress (NEWEST) - Call
-        # This makes id_show_2 and id_show_3_mixed redundant.
-        ModelResponse(
-            parts=[ToolCallPart(tool_name="plan_show_progress", args={}, tool_call_id="id_show_4")],
-            kind="response",
-            timestamp=ts,
-            usage=RequestUsage(),
-        ),
-        # Message 16: plan_show_progress (NEWEST) - Return
-        ModelRequest(
-            parts=[ToolReturnPart(tool_name="plan_show_progress", content="Progress 4", tool_call_id="id_show_4")],
-            kind="request",
-            timestamp=ts,
-        ),
-    ]
+            timestamp=_TS,
+            usage=_USAGE,
+        )
+    )
+    history.append(_mk_return("plan_show_progress", "Progress 2", "id_show_2_mixed"))
+    history.append(_mk_call("plan_show_progress", {}, "id_show_3"))
+    history.append(_mk_return("plan_show_progress", "Progress 3", "id_show_3"))
 
-    # Process
     new_history = planning.plan_history_processor(history)
 
-    # Assertions
-
-    # Should keep:
-    # Msg 0 (User)
-    # Msg 3, 4 (plan_create 2)
-    # Msg 9, 10 (plan_mark_step_complete 2)
-    # Msg 13 (Mixed - modified)
-    # Msg 15, 16 (plan_show_progress 4)
-
-    # Should remove:
-    # Msg 1, 2 (plan_create 1)
-    # Msg 5, 6 (plan_mark_step_complete 1)
-    # Msg 7, 8 (plan_show_progress 1)
-    # Msg 11, 12 (plan_show_progress 2)
-    # ToolCallPart from Msg 13
-    # Msg 14 (Return for mixed)
-
-    # Verify contents
-    # Helper to collect tool call ids present
-    present_tool_calls = set()
-    for m in new_history:
-        for p in m.parts:
-            if isinstance(p, ToolCallPart):
-                present_tool_calls.add(p.tool_call_id)
-            elif isinstance(p, ToolReturnPart):
-                # We can also track returns if we want strict checking
-                present_tool_calls.add(p.tool_call_id)
-
-    assert "id_create_1" not in present_tool_calls
-    assert "id_create_2" in present_tool_calls
-    assert "id_mark_1" not in present_tool_calls
-    assert "id_mark_2" in present_tool_calls
-    assert "id_show_1" not in present_tool_calls
-    assert "id_show_2" not in present_tool_calls
-    assert "id_show_3_mixed" not in present_tool_calls
-    assert "id_show_4" in present_tool_calls
-
-    # Find the mixed message (should be index 5 in the new list?)
-    # List: 0(User), 1-2(create2), 3-4(mark2), 5(Mixed), 6-7(show4) -> 8 messages
-    assert len(new_history) == 8
-
-    mixed_msg = new_history[5]
-    # Should be ModelResponse
-    assert isinstance(mixed_msg, ModelResponse)
-    # Should have 1 part (TextPart)
+    assert _present_tool_call_ids(new_history) == {"id_show_3"}
+    # User prompt, the mixed message reduced to its text, and the latest call/return pair
+    assert len(new_history) == 4
+
+    mixed_msg = new_history[1]
+    assert type(mixed_msg) is ModelResponse
     assert len(mixed_msg.parts) == 1
     assert isinstance(mixed_msg.parts[0], TextPart)
     assert mixed_msg.parts[0].content == "Thinking..."
+
+    # The pruned copy keeps the other fields and leaves the original message untouched
+    original_msg = history[3]
+    assert isinstance(original_msg, ModelResponse)
+    assert mixed_msg is not original_msg
+    assert mixed_msg.usage is original_msg.usage
+    assert mixed_msg.timestamp == original_msg.timestamp
+    assert mixed_msg.kind == "response"
+    assert len(original_msg.parts) == 2
+
+
+def test_plan_history_processor_without_redundant_calls() -> None:
+    planning = Planning()
+    history = _mk_history([("plan_create", "id_create_1")])
+
+    # The same list is returned when there is nothing to prune
+    assert planning.plan_history_processor(history) is history
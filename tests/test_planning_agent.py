@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 
 import pytest
@@ -7,33 +8,29 @@ from pydantic_ai import Agent, ModelMessage, ModelResponse, TextPart, ToolCallPa
 from pydantic_ai.models.function import AgentInfo, FunctionModel
 
 from pydantic_ai_cognitive.planning import Planning
-from pydantic_ai_cognitive.utils import EnumerateMessageWithParts
+from pydantic_ai_cognitive.utils import iter_message_parts
 
 pytestmark = pytest.mark.anyio
 
 
+@pytest.fixture
+def anyio_backend() -> str:
+    # Run async tests on asyncio only. FunctionModel does not depend on the event loop,
+    # so also running them on trio (when installed) would only double the runtime.
+    return "asyncio"
+
+
 @dataclass
 class AgentDeps:
     pass
 
 
-def test_planning_agent_flow() -> None:
-    """
-    Test the planning agent flow using FunctionModel to simulate the model's behavior.
-    This test verifies:
-    1. The model calls plan_create.
-    2. The model calls plan_show_progress.
-    3. The model calls plan_mark_step_complete.
-    4. The model calls plan_show_progress again.
-    5. The history processor correctly manages the history (tested via inspecting messages passed to the model).
-    """
-
-    # We track call count to simulate different responses
-    call_count = 0
+def _planning_model_function(state: dict[str, int]) -> Callable[[list[ModelMessage], AgentInfo], ModelResponse]:
+    """Build the scripted model, counting its calls in the mutable state so it can be reset between tests."""
 
     def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
-        nonlocal call_count
-        call_count += 1
+        state["count"] += 1
+        call_count = state["count"]
 
         # 1. First call: Create a plan
         if call_count == 1:
@@ -81,32 +78,62 @@ def test_planning_agent_flow() -> None:
         # 5. Fifth call: Finish
         elif call_count == 5:
             # Verify return for second show progress
-            tool_calls_in_history: list[ToolCallPart] = []
-            for _, parts in EnumerateMessageWithParts(messages):
-                for part in parts:
-                    if isinstance(part, ToolCallPart):
-                        tool_calls_in_history.append(part)
-
-            has_call_2 = any(p.tool_call_id == "call_2" for p in tool_calls_in_history)
-            has_call_4 = any(p.tool_call_id == "call_4" for p in tool_calls_in_history)
-            assert has_call_4, "History should contain the latest show_progress call"
-            assert not has_call_2, "History should NOT contain the older show_progress call"
+            tool_call_ids = {
+                part.tool_call_id
+                for _, parts in iter_message_parts(messages)
+                for part in parts
+                if isinstance(part, ToolCallPart)
+            }
+            assert "call_4" in tool_call_ids, "History should contain the latest show_progress call"
+            assert "call_2" not in tool_call_ids, "History should NOT contain the older show_progress call"
 
             return ModelResponse(parts=[TextPart("All done")])
 
         return ModelResponse(parts=[TextPart("Unexpected call")])
 
-    planning = Planning()
+    return model_function
+
+
+@pytest.fixture(scope="module")
+def planning() -> Planning:
+    return Planning()
+
 
-    agent: Agent[AgentDeps, str] = Agent(
-        model=FunctionModel(model_function),
+@pytest.fixture(scope="module")
+def model_state() -> dict[str, int]:
+    return {"count": 0}
+
+
+@pytest.fixture(scope="module")
+def agent(planning: Planning, model_state: dict[str, int]) -> Agent[AgentDeps, str]:
+    # Built once per module, agent construction compiles the tool schemas
+    return Agent(
+        model=FunctionModel(_planning_model_function(model_state)),
         toolsets=[planning.toolset()],
         history_processors=[planning.plan_history_processor],
         deps_type=AgentDeps,
         output_type=str,
     )
-    deps = AgentDeps()
-    result = agent.run_sync("Please do the task", deps=deps)
+
+
+@pytest.fixture(autouse=True)
+def _reset_agent_state(planning: Planning, model_state: dict[str, int]) -> Iterator[None]:
+    yield
+    model_state["count"] = 0
+    planning.reset()
+
+
+def test_planning_agent_flow(agent: Agent[AgentDeps, str], model_state: dict[str, int]) -> None:
+    """
+    Test the planning agent flow using FunctionModel to simulate the model's behavior.
+    This test verifies:
+    1. The model calls plan_create.
+    2. The model calls plan_show_progress.
+    3. The model calls plan_mark_step_complete.
+    4. The model calls plan_show_progress again.
+    5. The history processor correctly manages the history (tested via inspecting messages passed to the model).
+    """
+    result = agent.run_sync("Please do the task", deps=AgentDeps())
 
     assert result.output == "All done"
-    assert call_count == 5
+    assert model_state["count"] == 5
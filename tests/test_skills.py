@@ -1,10 +1,32 @@
+from functools import cache
 from pathlib import Path
 
 import pytest
+import yaml
+from pyfakefs.fake_filesystem import FakeFilesystem
 
+from pydantic_ai_cognitive import skills as skills_module
 from pydantic_ai_cognitive.skills import Skills
 
 
+@pytest.fixture
+def skills_root(fs: FakeFilesystem) -> Path:
+    """Root folder for skill files on pyfakefs' in-memory filesystem."""
+    root = Path("/skills")
+    fs.create_dir(root)
+    return root
+
+
+@cache
+def _render_skill_md(skill_name: str, description: str, license_info: str | None) -> bytes:
+    """Render skill.md content with YAML frontmatter, shared by all tests using the same metadata."""
+    frontmatter = f"---\nname: {skill_name}\ndescription: {description}\n"
+    if license_info:
+        frontmatter += f"license: {license_info}\n"
+    frontmatter += f"---\n\n# {skill_name.title()}\n\nBody of the skill content."
+    return frontmatter.encode()
+
+
 def create_skill_with_metadata(
     folder: Path, skill_name: str, description: str, license_info: str | None = None
 ) -> Path:
@@ -12,21 +34,15 @@ def create_skill_with_metadata(
     skill_folder = folder / skill_name.replace("-", "_")
     skill_folder.mkdir()
 
-    skill_md = skill_folder / "skill.md"
-    frontmatter = f"---\nname: {skill_name}\ndescription: {description}\n"
-    if license_info:
-        frontmatter += f"license: {license_info}\n"
-    frontmatter += f"---\n\n# {skill_name.title()}\n\nBody of the skill content."
-
-    skill_md.write_text(frontmatter)
+    (skill_folder / "skill.md").write_bytes(_render_skill_md(skill_name, description, license_info))
     return skill_folder
 
 
-def test_register_skill_with_yaml_frontmatter(tmp_path: Path) -> None:
+def test_register_skill_with_yaml_frontmatter(skills_root: Path) -> None:
     """Test successful skill registration with YAML frontmatter."""
     skills = Skills()
 
-    skill_folder = create_skill_with_metadata(tmp_path, "python-best-practices", "Python coding best practices")
+    skill_folder = create_skill_with_metadata(skills_root, "python-best-practices", "Python coding best practices")
 
     skills.register_skill(skill_folder)
 
@@ -37,11 +53,11 @@ def test_register_skill_with_yaml_frontmatter(tmp_path: Path) -> None:
     assert skills._skills["python-best-practices"].license is None
 
 
-def test_register_skill_with_license(tmp_path: Path) -> None:
+def test_register_skill_with_license(skills_root: Path) -> None:
     """Test skill registration with license metadata."""
     skills = Skills()
 
-    skill_folder = create_skill_with_metadata(tmp_path, "git-workflow", "Git workflow guide", license_info="MIT")
+    skill_folder = create_skill_with_metadata(skills_root, "git-workflow", "Git workflow guide", license_info="MIT")
 
     skills.register_skill(str(skill_folder))
 
@@ -49,12 +65,12 @@ def test_register_skill_with_license(tmp_path: Path) -> None:
     assert skills._skills["git-workflow"].license == "MIT"
 
 
-def test_register_skill_recursive_search(tmp_path: Path) -> None:
+def test_register_skill_recursive_search(skills_root: Path) -> None:
     """Test that skill.md is found in subdirectories."""
     skills = Skills()
 
     # Create nested structure
-    parent = tmp_path / "parent_folder"
+    parent = skills_root / "parent_folder"
     parent.mkdir()
     skill_folder = parent / "actual_skill"
     skill_folder.mkdir()
@@ -77,104 +93,115 @@ def test_register_skill_folder_not_found() -> None:
         skills.register_skill("/nonexistent/path")
 
 
-def test_register_skill_not_a_directory(tmp_path: Path) -> None:
+def test_register_skill_not_a_directory(skills_root: Path) -> None:
     """Test error when skill path is not a directory."""
     skills = Skills()
 
     # Create a file instead of a directory
-    skill_file = tmp_path / "skill_file.txt"
+    skill_file = skills_root / "skill_file.txt"
     skill_file.write_text("Not a directory")
 
     with pytest.raises(ValueError, match="must be a directory"):
         skills.register_skill(skill_file)
 
 
-def test_register_skill_missing_skill_md(tmp_path: Path) -> None:
+def test_register_skill_missing_skill_md(skills_root: Path) -> None:
     """Test error when skill.md is missing."""
     skills = Skills()
 
-    skill_folder = tmp_path / "incomplete_skill"
+    skill_folder = skills_root / "incomplete_skill"
     skill_folder.mkdir()
 
     with pytest.raises(ValueError, match=r"No skill\.md files found"):
         skills.register_skill(skill_folder)
 
 
-def test_register_skill_missing_frontmatter(tmp_path: Path) -> None:
-    """Test error when YAML frontmatter is missing."""
-    skills = Skills()
-
-    skill_folder = tmp_path / "no_frontmatter"
-    skill_folder.mkdir()
-
-    skill_md = skill_folder / "skill.md"
-    skill_md.write_text("# Just a heading\n\nNo frontmatter here.")
-
-    with pytest.raises(ValueError, match="No YAML frontmatter found"):
-        skills.register_skill(skill_folder)
-
-
-def test_register_skill_missing_name_field(tmp_path: Path) -> None:
-    """Test error when 'name' field is missing from frontmatter."""
-    skills = Skills()
-
-    skill_folder = tmp_path / "no_name"
-    skill_folder.mkdir()
-
-    skill_md = skill_folder / "skill.md"
-    skill_md.write_text("---\ndescription: A description\n---\n\nContent")
-
-    with pytest.raises(ValueError, match="Missing required 'name' field"):
-        skills.register_skill(skill_folder)
-
-
-def test_register_skill_missing_description_field(tmp_path: Path) -> None:
-    """Test error when 'description' field is missing from frontmatter."""
+@pytest.mark.parametrize(
+    "content,match",
+    [
+        pytest.param("# Just a heading\n\nNo frontmatter here.", "No YAML frontmatter found", id="missing_frontmatter"),
+        pytest.param(
+            "---\ndescription: A description\n---\n\nContent", "Missing required 'name' field", id="missing_name"
+        ),
+        pytest.param(
+            "---\nname: test-skill\n---\n\nContent", "Missing required 'description' field", id="missing_description"
+        ),
+        pytest.param("---\nname: \ndescription: A description\n---\n\nContent", "Empty 'name' field", id="empty_name"),
+        pytest.param(
+            "---\nname: test-skill\ndescription: \n---\n\nContent", "Empty 'description' field", id="empty_description"
+        ),
+        pytest.param("---\nname: a: b\ndescription: d\n---\n\nContent", "Invalid YAML frontmatter", id="invalid_yaml"),
+    ],
+)
+def test_register_skill_validation_errors(skills_root: Path, content: str, match: str) -> None:
+    """Test errors for skill.md files with missing or invalid frontmatter."""
     skills = Skills()
 
-    skill_folder = tmp_path / "no_desc"
+    skill_folder = skills_root / "invalid_skill"
     skill_folder.mkdir()
+    (skill_folder / "skill.md").write_text(content)
 
-    skill_md = skill_folder / "skill.md"
-    skill_md.write_text("---\nname: test-skill\n---\n\nContent")
-
-    with pytest.raises(ValueError, match="Missing required 'description' field"):
+    with pytest.raises(ValueError, match=match):
         skills.register_skill(skill_folder)
 
 
-def test_register_skill_empty_name(tmp_path: Path) -> None:
-    """Test error when name is empty."""
+@pytest.mark.parametrize(
+    "frontmatter", [pytest.param("", id="empty"), pytest.param("# only a comment", id="comment_only")]
+)
+def test_register_skill_empty_frontmatter(skills_root: Path, frontmatter: str) -> None:
+    """Test that frontmatter without any key is rejected, as YAML reads it as null."""
     skills = Skills()
 
-    skill_folder = tmp_path / "empty_name"
+    skill_folder = skills_root / "empty_frontmatter"
     skill_folder.mkdir()
+    (skill_folder / "skill.md").write_text(f"---\n{frontmatter}\n---\n\nContent")
 
-    skill_md = skill_folder / "skill.md"
-    skill_md.write_text("---\nname: \ndescription: A description\n---\n\nContent")
-
-    with pytest.raises(ValueError, match="Empty 'name' field"):
+    with pytest.raises(TypeError, match="YAML frontmatter must be a dictionary"):
         skills.register_skill(skill_folder)
 
 
-def test_register_skill_empty_description(tmp_path: Path) -> None:
-    """Test error when description is empty."""
-    skills = Skills()
-
-    skill_folder = tmp_path / "empty_desc"
-    skill_folder.mkdir()
-
-    skill_md = skill_folder / "skill.md"
-    skill_md.write_text("---\nname: test-skill\ndescription: \n---\n\nContent")
-
-    with pytest.raises(ValueError, match="Empty 'description' field"):
-        skills.register_skill(skill_folder)
-
-
-def test_skill_load_default_artifact(tmp_path: Path) -> None:
+@pytest.mark.parametrize(
+    "frontmatter",
+    [
+        pytest.param("name: n\ndescription: d", id="plain"),
+        pytest.param("name: n\n1: one", id="int_key"),
+        pytest.param("name: n\n~: tilde", id="tilde_key"),
+        pytest.param("name: n\nnull: null_key", id="null_key"),
+        pytest.param("name: n\nTrue: bool_key", id="bool_key"),
+        pytest.param("name: n\n.5: float_key", id="float_key"),
+    ],
+)
+def test_simple_frontmatter_parser_matches_yaml(frontmatter: str) -> None:
+    """Test that the fast frontmatter parser either agrees with YAML or defers to it."""
+    metadata = skills_module._parse_frontmatter(frontmatter, Path("skill.md"))
+
+    assert metadata == yaml.safe_load(frontmatter)
+
+
+@pytest.mark.parametrize(
+    "frontmatter",
+    [
+        pytest.param("name: n\ndescription: a\tb", id="tab_in_value"),
+        pytest.param("name: n\t", id="trailing_tab"),
+        pytest.param("name: n\n\t\ndescription: d", id="tab_only_line"),
+        pytest.param("name: =", id="value_key_value"),
+        pytest.param("<<: x\nname: n", id="merge_key"),
+    ],
+)
+def test_simple_frontmatter_parser_rejects_like_yaml(frontmatter: str) -> None:
+    """Test that frontmatter YAML rejects is not accepted by the fast parser either."""
+    with pytest.raises(yaml.YAMLError):
+        yaml.safe_load(frontmatter)
+
+    with pytest.raises(ValueError, match="Invalid YAML frontmatter"):
+        skills_module._parse_frontmatter(frontmatter, Path("skill.md"))
+
+
+def test_skill_load_default_artifact(skills_root: Path) -> None:
     """Test loading the default skill.md file."""
     skills = Skills()
 
-    skill_folder = create_skill_with_metadata(tmp_path, "my-skill", "My skill description")
+    skill_folder = create_skill_with_metadata(skills_root, "my-skill", "My skill description")
 
     skills.register_skill(str(skill_folder))
 
@@ -188,11 +215,11 @@ def test_skill_load_default_artifact(tmp_path: Path) -> None:
     assert "name: my-skill" in result
 
 
-def test_skill_load_specific_artifact(tmp_path: Path) -> None:
+def test_skill_load_specific_artifact(skills_root: Path) -> None:
     """Test loading a specific artifact file."""
     skills = Skills()
 
-    skill_folder = create_skill_with_metadata(tmp_path, "data-skill", "Data processing skill")
+    skill_folder = create_skill_with_metadata(skills_root, "data-skill", "Data processing skill")
 
     # Create additional artifact
     artifact_content = "Additional artifact data"
@@ -214,11 +241,11 @@ def test_skill_load_unregistered_skill() -> None:
     assert "Available skills: none" in result
 
 
-def test_skill_load_missing_artifact(tmp_path: Path) -> None:
+def test_skill_load_missing_artifact(skills_root: Path) -> None:
     """Test error message when artifact file doesn't exist."""
     skills = Skills()
 
-    skill_folder = create_skill_with_metadata(tmp_path, "test-skill", "Test skill")
+    skill_folder = create_skill_with_metadata(skills_root, "test-skill", "Test skill")
 
     skills.register_skill(skill_folder)
 
@@ -226,16 +253,33 @@ def test_skill_load_missing_artifact(tmp_path: Path) -> None:
     assert "Error: Artifact file not found" in result
 
 
-def test_toolset_creation(tmp_path: Path) -> None:
+# Phrases the skill_load description must contain, checked together so a failure lists all that are missing
+_REGISTERED_SKILL_PHRASES = (
+    "name: skill-a",
+    "name: skill-b",
+    "description: Description for skill A",
+    "description: Description for skill B",
+    "license: MIT",
+    "USAGE INSTRUCTIONS",
+)
+
+_INSTRUCTION_PHRASES = (
+    "SKILL SYSTEM:",
+    "USAGE INSTRUCTIONS:",
+    "EXAMPLES:",
+    "Always load relevant skills",
+)
+
+
+def test_toolset_creation(skills_root: Path) -> None:
     """Test that toolset is created correctly with dynamic schema."""
     skills = Skills()
 
     # Register two skills
-    create_skill_with_metadata(tmp_path, "skill-a", "Description for skill A", license_info="MIT")
-    create_skill_with_metadata(tmp_path, "skill-b", "Description for skill B")
-
-    for skill_folder in tmp_path.iterdir():
-        skills.register_skill(skill_folder)
+    skills.register_skill([
+        create_skill_with_metadata(skills_root, "skill-a", "Description for skill A", license_info="MIT"),
+        create_skill_with_metadata(skills_root, "skill-b", "Description for skill B"),
+    ])
 
     toolset = skills.toolset()
 
@@ -246,12 +290,8 @@ def test_toolset_creation(tmp_path: Path) -> None:
     # Verify description mentions available skills in multiline format
     description = toolset.tools["skill_load"].description
     assert description is not None
-    assert "name: skill-a" in description
-    assert "name: skill-b" in description
-    assert "description: Description for skill A" in description
-    assert "description: Description for skill B" in description
-    assert "license: MIT" in description
-    assert "USAGE INSTRUCTIONS" in description
+    missing = [phrase for phrase in _REGISTERED_SKILL_PHRASES if phrase not in description]
+    assert not missing, missing
 
 
 def test_toolset_no_skills() -> None:
@@ -265,34 +305,30 @@ def test_toolset_no_skills() -> None:
     assert "No skills registered" in toolset.tools["skill_load"].description
 
 
-def test_toolset_includes_ai_instructions(tmp_path: Path) -> None:
+def test_toolset_includes_ai_instructions(skills_root: Path) -> None:
     """Test that toolset description includes instructions for AI."""
     skills = Skills()
 
-    create_skill_with_metadata(tmp_path, "test-skill", "Test description")
-    for skill_folder in tmp_path.iterdir():
-        skills.register_skill(str(skill_folder))
+    skill_folder = create_skill_with_metadata(skills_root, "test-skill", "Test description")
+    skills.register_skill(str(skill_folder))
 
     toolset = skills.toolset()
     description = toolset.tools["skill_load"].description
 
     # Check for key instruction elements
     assert description is not None
-    assert "SKILL SYSTEM:" in description
-    assert "USAGE INSTRUCTIONS:" in description
-    assert "EXAMPLES:" in description
-    assert "Always load relevant skills" in description
+    missing = [phrase for phrase in _INSTRUCTION_PHRASES if phrase not in description]
+    assert not missing, missing
 
 
-def test_multiple_skill_registration(tmp_path: Path) -> None:
+def test_multiple_skill_registration(skills_root: Path) -> None:
     """Test registering multiple skills."""
     skills = Skills()
 
-    for i in range(3):
-        create_skill_with_metadata(tmp_path, f"skill-{i}", f"Description for skill {i}")
-
-    for skill_folder in tmp_path.iterdir():
-        skills.register_skill(str(skill_folder))
+    skill_folders = [
+        create_skill_with_metadata(skills_root, f"skill-{i}", f"Description for skill {i}") for i in range(3)
+    ]
+    skills.register_skill(skill_folders)
 
     assert len(skills._skills) == 3
     assert "skill-0" in skills._skills
@@ -300,12 +336,20 @@ def test_multiple_skill_registration(tmp_path: Path) -> None:
     assert "skill-2" in skills._skills
 
 
-def test_skill_name_from_metadata_not_folder(tmp_path: Path) -> None:
+def test_register_skill_empty_folder_list() -> None:
+    """Test that registering an empty list of folders raises like an empty folder does."""
+    skills = Skills()
+
+    with pytest.raises(ValueError, match="No skill folders given"):
+        skills.register_skill([])
+
+
+def test_skill_name_from_metadata_not_folder(skills_root: Path) -> None:
     """Test that skill name comes from metadata, not folder name."""
     skills = Skills()
 
     # Folder name is different from skill name in metadata
-    skill_folder = tmp_path / "folder_name"
+    skill_folder = skills_root / "folder_name"
     skill_folder.mkdir()
 
     skill_md = skill_folder / "skill.md"
@@ -320,7 +364,7 @@ def test_skill_name_from_metadata_not_folder(tmp_path: Path) -> None:
 
 
 def test_register_multiple_skills_from_one_folder(tmp_path: Path) -> None:
-    """Test registering multiple skills from a single folder with subdirectories."""
+    """Test registering multiple skills from a single folder with subdirectories on the real filesystem."""
     skills = Skills()
 
     parent_folder = tmp_path / "all_skills"
@@ -353,3 +397,127 @@ def test_register_multiple_skills_from_one_folder(tmp_path: Path) -> None:
     assert skills._skills["python-basics"].folder_path == skill_1
     assert skills._skills["python-advanced"].folder_path == skill_2
     assert skills._skills["git-workflow"].folder_path == nested
+
+
+def test_register_skill_frontmatter_larger_than_read_head(skills_root: Path) -> None:
+    """Test that frontmatter longer than the initial read is still parsed."""
+    skills = Skills()
+
+    long_description = "Very long description " * 600
+    skill_folder = create_skill_with_metadata(skills_root, "long-skill", long_description)
+
+    skills.register_skill(skill_folder)
+
+    assert skills._skills["long-skill"].description == long_description.strip()
+
+
+def test_register_skill_reuses_parsed_metadata(skills_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that registering an unchanged skill.md again does not parse it again."""
+    parse_calls: list[str] = []
+    parse_frontmatter = skills_module._parse_frontmatter
+
+    def counting_parse_frontmatter(frontmatter_text: str, skill_md_path: Path) -> object:
+        parse_calls.append(str(skill_md_path))
+        return parse_frontmatter(frontmatter_text, skill_md_path)
+
+    monkeypatch.setattr(skills_module, "_parse_frontmatter", counting_parse_frontmatter)
+
+    skill_folder = create_skill_with_metadata(skills_root, "cached-skill", "Cached skill")
+    Skills().register_skill(skill_folder)
+    Skills().register_skill(skill_folder)
+
+    assert parse_calls == [str(skill_folder / "skill.md")]
+
+
+def test_register_skill_reloads_modified_metadata(skills_root: Path) -> None:
+    """Test that re-registering a modified skill.md picks up the new metadata."""
+    skills = Skills()
+
+    skill_folder = create_skill_with_metadata(skills_root, "evolving-skill", "First description")
+    skills.register_skill(skill_folder)
+    assert skills._skills["evolving-skill"].description == "First description"
+
+    (skill_folder / "skill.md").write_text("---\nname: evolving-skill\ndescription: Second, longer description\n---\n")
+    skills.register_skill(skill_folder)
+    assert skills._skills["evolving-skill"].description == "Second, longer description"
+
+
+def test_register_skill_quoted_frontmatter_values(skills_root: Path) -> None:
+    """Test that quoted frontmatter values are unquoted."""
+    skills = Skills()
+
+    skill_folder = skills_root / "quoted"
+    skill_folder.mkdir()
+    (skill_folder / "skill.md").write_text(
+        "---\nname: 'quoted-skill'\ndescription: \"Usage: load it first\"\nlicense: MIT\n---\n\nContent"
+    )
+
+    skills.register_skill(skill_folder)
+
+    assert skills._skills["quoted-skill"].description == "Usage: load it first"
+    assert skills._skills["quoted-skill"].license == "MIT"
+
+
+def test_register_skill_yaml_block_frontmatter(skills_root: Path) -> None:
+    """Test that frontmatter using richer YAML syntax is still parsed."""
+    skills = Skills()
+
+    skill_folder = skills_root / "folded"
+    skill_folder.mkdir()
+    (skill_folder / "skill.md").write_text(
+        "---\nname: folded-skill  # trailing comment\ndescription: >\n  A description\n  over two lines\n---\n\nContent"
+    )
+
+    skills.register_skill(skill_folder)
+
+    assert "folded-skill" in skills._skills
+    assert skills._skills["folded-skill"].description == "A description over two lines"
+
+
+def test_toolset_cached_until_registration(skills_root: Path) -> None:
+    """Test that the skill_load tool is reused until a new skill is registered."""
+    skills = Skills()
+
+    skills.register_skill(create_skill_with_metadata(skills_root, "skill-a", "Description for skill A"))
+    toolset = skills.toolset()
+    tool = toolset.tools["skill_load"]
+    # Each toolset gets a copy of the tool, but the schema is only built once
+    assert skills.toolset().tools["skill_load"].function_schema is tool.function_schema
+
+    skills.register_skill(create_skill_with_metadata(skills_root, "skill-b", "Description for skill B"))
+    new_tool = skills.toolset().tools["skill_load"]
+    assert new_tool.description != tool.description
+
+    description = new_tool.description
+    assert description is not None
+    assert "name: skill-b" in description
+
+
+def test_toolset_is_not_shared() -> None:
+    """Test that changes to one toolset or its tool do not leak into the next."""
+    skills = Skills()
+
+    toolset = skills.toolset()
+    toolset.add_function(lambda: "extra", name="extra_tool")
+
+    toolset.tools["skill_load"].max_retries = 7
+
+    assert toolset is not skills.toolset()
+    assert set(skills.toolset().tools) == {"skill_load"}
+    assert skills.toolset().tools["skill_load"].max_retries != 7
+
+
+def test_skill_load_returns_modified_content(skills_root: Path) -> None:
+    """Test that loading an artifact again picks up changes made on disk."""
+    skills = Skills()
+
+    skill_folder = create_skill_with_metadata(skills_root, "notes-skill", "Notes skill")
+    artifact_file = skill_folder / "notes.txt"
+    artifact_file.write_text("first")
+
+    skills.register_skill(skill_folder)
+    assert skills.skill_load("notes-skill", "notes.txt") == "first"
+    assert skills.skill_load("notes-skill", "notes.txt") == "first"
+
+    artifact_file.write_text("second version")
+    assert skills.skill_load("notes-skill", "notes.txt") == "second version"